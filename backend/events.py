@@ -0,0 +1,133 @@
+"""In-process pub/sub used to push new leads to SSE subscribers.
+
+Event ids sent to clients are ``<epoch>-<sequence>``. The epoch is random
+per process, so a ``Last-Event-ID`` from before a restart is recognised as
+unresumable instead of being mistaken for an id of the new process.
+"""
+
+import asyncio
+import itertools
+import json
+import uuid
+from collections import deque
+from typing import AsyncIterator, Deque, Iterable, Optional, Set, Tuple
+
+Event = Tuple[int, str]
+
+
+class Subscription:
+    """A subscriber's bounded buffer of pending events.
+
+    Replayed history is kept apart from the live buffer, so a resume can
+    return everything still in the broadcaster's history.
+    """
+
+    def __init__(self, maxsize: int, backlog: Iterable[Event] = (), missed: Optional[int] = 0):
+        self._backlog: Deque[Event] = deque(backlog)
+        self._queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=maxsize)
+        self._dropped = 0
+        # Events lost before subscribing (None when the count is unknown).
+        self.missed = missed
+
+    def push(self, event: Event):
+        # A slow client must never block the publisher: drop its oldest
+        # pending event and tell it about the gap on its next read.
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._dropped += 1
+        self._queue.put_nowait(event)
+
+    def take_dropped(self) -> int:
+        """Return how many events were dropped since the last call."""
+        dropped, self._dropped = self._dropped, 0
+        return dropped
+
+    async def get(self) -> Event:
+        if self._backlog:
+            return self._backlog.popleft()
+        return await self._queue.get()
+
+
+class Broadcaster:
+    """Fans events out to subscribers and keeps a short replay history."""
+
+    def __init__(self, history_size: int = 500, subscriber_buffer: int = 100):
+        self.epoch = uuid.uuid4().hex[:8]
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._history: Deque[Event] = deque(maxlen=history_size)
+        self._subscribers: Set[Subscription] = set()
+        self._subscriber_buffer = subscriber_buffer
+
+    def publish(self, data: str) -> int:
+        event = (next(self._ids), data)
+        self._last_id = event[0]
+        self._history.append(event)
+        for subscription in self._subscribers:
+            subscription.push(event)
+        return event[0]
+
+    def format_id(self, event_id: int) -> str:
+        return f"{self.epoch}-{event_id}"
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Subscription:
+        """Subscribe, replaying history after ``last_event_id`` if given.
+
+        If the id belongs to another process or is no longer covered by the
+        history, the subscription's ``missed`` is set so the client can be
+        told to resync.
+        """
+        backlog = []
+        missed: Optional[int] = 0
+        if last_event_id is not None:
+            epoch, _, sequence = last_event_id.partition("-")
+            if epoch != self.epoch or not sequence.isdigit() or int(sequence) > self._last_id:
+                missed = None
+            else:
+                last_seen = int(sequence)
+                oldest = self._history[0][0] if self._history else self._last_id + 1
+                missed = max(0, oldest - 1 - last_seen)
+                backlog = [event for event in self._history if event[0] > last_seen]
+        subscription = Subscription(self._subscriber_buffer, backlog, missed)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+
+def _resync_frame(dropped: Optional[int]) -> str:
+    return f"event: resync\ndata: {json.dumps({'dropped': dropped})}\n\n"
+
+
+async def sse_stream(
+    broadcaster: Broadcaster,
+    event_name: str,
+    last_event_id: Optional[str] = None,
+    heartbeat: float = 15.0,
+) -> AsyncIterator[str]:
+    """Yield Server-Sent Events frames until the client disconnects.
+
+    A ``resync`` event is sent when the client has lost events: right away
+    when ``last_event_id`` cannot be fully replayed, and before the next
+    event when a slow subscriber's buffer overflowed. Its ``dropped`` field
+    is the number of lost events, or null when it is unknown.
+    """
+    subscription = broadcaster.subscribe(last_event_id)
+    try:
+        yield "retry: 3000\n\n"
+        if subscription.missed != 0:
+            yield _resync_frame(subscription.missed)
+        while True:
+            try:
+                event_id, data = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Comment frame keeps proxies from closing an idle connection.
+                yield ": keep-alive\n\n"
+                continue
+            dropped = subscription.take_dropped()
+            if dropped:
+                yield _resync_frame(dropped)
+            yield f"id: {broadcaster.format_id(event_id)}\nevent: {event_name}\ndata: {data}\n\n"
+    finally:
+        broadcaster.unsubscribe(subscription)
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Generate reproducible synthetic data and benchmark the API handlers.
+
+Examples:
+    python generate_data.py --contacts 100000 --iterations 20
+    python generate_data.py --backend mongo --db-name exhibilo_scale --wipe \
+        --contacts 1000000 --projects-per-category 5000
+    python generate_data.py --backend mongo --db-name exhibilo_scale --skip-load --iterations 50
+
+The in-memory backend is the default. MongoDB runs need a dedicated
+``--db-name``; the app's own database (``DB_NAME`` in .env) is refused, and
+existing documents are only deleted with ``--wipe``.
+
+Every chunk is generated from its own RNG derived from ``--seed``, so the
+same arguments always produce the same documents regardless of how the
+parallel inserts are scheduled.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+INDUSTRIES = ["Cosmética", "Bebidas", "Alimentos", "Retail", "Tecnología", "Farmacia", "Otro"]
+CATEGORIES = ["Cosmética", "Bebidas", "Alimentos", "Retail"]
+ICONS = ["Palette", "Factory", "Truck", "Box", "Layers", "Ruler"]
+FIRST_NAMES = ["María", "Carlos", "Ana", "Juan", "Lucía", "Martín", "Sofía", "Diego", "Valentina", "Pablo"]
+LAST_NAMES = ["González", "Rodríguez", "Martínez", "Pérez", "López", "Fernández", "García", "Sánchez"]
+COMPANY_SUFFIXES = ["SA", "SRL", "Group", "Retail", "Global", "Solutions"]
+POSITIONS = ["Gerente de Marketing", "Director Comercial", "Brand Manager", "Trade Marketing", "Compras"]
+MATERIALS = ["cartón", "madera", "metal", "acrílico"]
+
+# Fixed reference time so timestamps are reproducible too.
+BASE_TIME = datetime(2025, 1, 1)
+TIME_SPREAD_SECONDS = 3 * 365 * 24 * 3600
+
+
+def _rng(seed: int, collection: str, chunk: int) -> random.Random:
+    return random.Random(f"{seed}:{collection}:{chunk}")
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _created_at(rng: random.Random) -> datetime:
+    return BASE_TIME - timedelta(seconds=rng.randrange(TIME_SPREAD_SECONDS))
+
+
+def make_contacts(rng: random.Random, count: int):
+    docs = []
+    for _ in range(count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company = f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}"
+        industry = rng.choice(INDUSTRIES)
+        docs.append({
+            "id": _uuid(rng),
+            "name": f"{first} {last}",
+            "company": company,
+            "email": f"{first.lower()}.{last.lower()}{rng.randrange(100000)}@example.com",
+            "phone": f"+54 11 {rng.randrange(1000, 10000)}-{rng.randrange(1000, 10000)}" if rng.random() < 0.7 else None,
+            "industry": industry,
+            "message": f"Necesitamos exhibidores de {rng.choice(MATERIALS)} para {industry.lower()}.",
+            "created_at": _created_at(rng),
+            "status": rng.choice(["new", "new", "new", "contacted", "closed"]),
+        })
+    return docs
+
+
+def make_projects(rng: random.Random, count: int, category: str):
+    docs = []
+    for _ in range(count):
+        material = rng.choice(MATERIALS)
+        docs.append({
+            "id": _uuid(rng),
+            "title": f"Display {category} {rng.randrange(100000)}",
+            "category": category,
+            "image": f"https://images.unsplash.com/photo-{rng.randrange(10**12)}?w=400&h=300&fit=crop",
+            "description": f"Exhibidor de {material} para {category.lower()}",
+            "created_at": _created_at(rng),
+            "featured": rng.random() < 0.1,
+        })
+    return docs
+
+
+def make_services(rng: random.Random, count: int):
+    return [
+        {
+            "id": _uuid(rng),
+            "title": f"Servicio {i + 1}",
+            "description": f"Soluciones en {rng.choice(MATERIALS)} para puntos de venta.",
+            "icon": rng.choice(ICONS),
+            "order": i + 1,
+        }
+        for i in range(count)
+    ]
+
+
+def make_testimonials(rng: random.Random, count: int):
+    docs = []
+    for _ in range(count):
+        docs.append({
+            "id": _uuid(rng),
+            "quote": f"Los exhibidores aumentaron nuestras ventas un {rng.randrange(5, 80)}%.",
+            "author": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "position": rng.choice(POSITIONS),
+            "company": f"{rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}",
+            "created_at": _created_at(rng),
+            "active": rng.random() < 0.8,
+        })
+    return docs
+
+
+async def load_chunks(repository, collection, total, chunk_size, seed, semaphore, factory):
+    """Insert ``total`` documents in parallel chunks of ``chunk_size``."""
+
+    async def load_chunk(index, size):
+        async with semaphore:
+            docs = factory(_rng(seed, collection, index), size)
+            return await repository.insert_many(docs)
+
+    tasks = [
+        load_chunk(index, min(chunk_size, total - start))
+        for index, start in enumerate(range(0, total, chunk_size))
+    ]
+    return sum(await asyncio.gather(*tasks))
+
+
+async def load(storage, args):
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    if args.wipe:
+        for repository in (storage.contacts, storage.projects, storage.services, storage.testimonials):
+            await repository.delete_many()
+
+    plan = [("contacts", storage.contacts, args.contacts, make_contacts)]
+    for category in CATEGORIES:
+        plan.append((
+            f"projects:{category}",
+            storage.projects,
+            args.projects_per_category,
+            lambda rng, size, category=category: make_projects(rng, size, category),
+        ))
+    plan.append(("services", storage.services, args.services, make_services))
+    plan.append(("testimonials", storage.testimonials, args.testimonials, make_testimonials))
+
+    for collection, repository, total, factory in plan:
+        start = time.perf_counter()
+        inserted = await load_chunks(repository, collection, total, args.chunk_size, args.seed, semaphore, factory)
+        elapsed = time.perf_counter() - start
+        rate = inserted / elapsed if elapsed else 0
+        print(f"loaded {inserted:>10} {collection:<24} in {elapsed:8.2f}s ({rate:,.0f} docs/s)")
+
+
+async def benchmark(server, iterations):
+    """Time the GET handlers against the loaded data.
+
+    The circuit breaker and per-call timeout are disabled so slow queries are
+    measured as they are, rather than replaced by snapshot fallbacks.
+    """
+    from resilience import CircuitBreaker
+
+    server.db_breaker = CircuitBreaker(failure_threshold=None)
+    server.DB_TIMEOUT = None
+
+    queries = [
+        ("GET /api/contacts", server.get_contacts),
+        ("GET /api/projects", lambda: server.get_projects(None)),
+        ("GET /api/projects?category=Retail", lambda: server.get_projects("Retail")),
+        ("GET /api/services", server.get_services),
+        ("GET /api/testimonials", server.get_testimonials),
+        ("GET /api/company", server.get_company_info),
+    ]
+    print(f"\n{'query':<36} {'min ms':>9} {'median':>9} {'p95':>9} {'errors':>7}")
+    for name, handler in queries:
+        timings = []
+        errors = 0
+        for _ in range(iterations):
+            start = time.perf_counter()
+            try:
+                response = await handler()
+            except Exception:
+                errors += 1
+                continue
+            if getattr(response, "headers", {}).get("x-exhibilo-stale"):
+                errors += 1
+                continue
+            timings.append((time.perf_counter() - start) * 1000)
+        if not timings:
+            print(f"{name:<36} {'-':>9} {'-':>9} {'-':>9} {errors:>7}")
+            continue
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(f"{name:<36} {timings[0]:9.2f} {statistics.median(timings):9.2f} {p95:9.2f} {errors:>7}")
+
+
+async def main(args):
+    # Import after STORAGE_BACKEND is set so the server builds the right storage.
+    import server
+
+    try:
+        if not args.skip_load:
+            await load(server.storage, args)
+        if args.iterations:
+            await benchmark(server, args.iterations)
+    finally:
+        await server.catalog_snapshots.close()
+        server.storage.close()
+        server.log_listener.stop()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["mongo", "memory"], default="memory")
+    parser.add_argument("--db-name", help="dedicated MongoDB database (required with --backend mongo)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--contacts", type=int, default=100000)
+    parser.add_argument("--projects-per-category", type=int, default=1000)
+    parser.add_argument("--services", type=int, default=30)
+    parser.add_argument("--testimonials", type=int, default=300)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=8, help="chunks inserted in parallel")
+    parser.add_argument("--wipe", action="store_true", help="delete existing documents before loading")
+    parser.add_argument("--skip-load", action="store_true", help="only run the benchmark queries")
+    parser.add_argument("--iterations", type=int, default=10, help="benchmark runs per query (0 to skip)")
+    args = parser.parse_args()
+
+    if args.backend == "mongo":
+        app_db = os.environ.get("DB_NAME") or dotenv_values(Path(__file__).parent / ".env").get("DB_NAME")
+        if not args.db_name:
+            parser.error("--db-name is required with --backend mongo")
+        if args.db_name == app_db:
+            parser.error(f"refusing to write synthetic data into the app database {app_db!r}")
+    elif args.skip_load:
+        parser.error("--skip-load needs --backend mongo; the in-memory store starts empty")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    os.environ["STORAGE_BACKEND"] = args.backend
+    if args.db_name:
+        os.environ["DB_NAME"] = args.db_name
+    # Keep synthetic catalog responses out of the snapshot the real server
+    # falls back to during database outages.
+    with tempfile.TemporaryDirectory(prefix="exhibilo-bench-") as snapshot_dir:
+        os.environ["SNAPSHOT_PATH"] = os.path.join(snapshot_dir, "catalog_snapshot.json")
+        asyncio.run(main(args))
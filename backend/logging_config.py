@@ -0,0 +1,183 @@
+"""Non-blocking JSON logging for the Exhibilo API.
+
+Records are put on a bounded in-memory queue from the request path and
+written by a ``QueueListener`` thread, so handlers never do log I/O on the
+event loop. Each record carries the current request ID, and access logs for
+high-volume routes are sampled.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+ACCESS_LOGGER = "exhibilo.access"
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key in ("method", "path", "status", "duration_ms"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    # Runs on the caller's side of the queue, where the context var is set.
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps only a fraction of access records for the configured paths.
+
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or record.name != ACCESS_LOGGER:
+            return True
+        rate = self.sample_rates.get(getattr(record, "path", None))
+        return rate is None or random.random() < rate
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Drops records instead of blocking (or writing to stderr) when full."""
+
+    dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BackgroundLogListener(QueueListener):
+    """Queue listener that reports records dropped by its handler on stop."""
+
+    def __init__(self, queue_handler: DroppingQueueHandler, *handlers, **kwargs):
+        super().__init__(queue_handler.queue, *handlers, **kwargs)
+        self.queue_handler = queue_handler
+
+    def stop(self):
+        super().stop()
+        dropped = self.queue_handler.dropped
+        if dropped:
+            self.handle(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": "Dropped %s log records because the queue was full",
+                "args": (dropped,),
+            }))
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+) -> BackgroundLogListener:
+    """Route root and uvicorn logging through a background JSON writer.
+
+    uvicorn's own access log is disabled because ``RequestLoggingMiddleware``
+    already logs every request. Returns the started listener; call
+    ``stop()`` on shutdown to flush it and report dropped records.
+    """
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+    queue_handler = DroppingQueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+    queue_handler.addFilter(SamplingFilter(sample_rates or {}))
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(level)
+
+    # uvicorn configures these before importing the app, with handlers that
+    # write synchronously; replace them so nothing bypasses the queue.
+    for name in ("uvicorn", "uvicorn.error"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    access_logger = logging.getLogger("uvicorn.access")
+    access_logger.handlers = []
+    access_logger.propagate = False
+    access_logger.disabled = True
+
+    listener = BackgroundLogListener(queue_handler, stream_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+class RequestLoggingMiddleware:
+    """Assigns a request ID, echoes it as ``X-Request-ID`` and logs access."""
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = logging.getLogger(ACCESS_LOGGER)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_request_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self.logger.log(
+                logging.ERROR if status >= 500 else logging.INFO,
+                "%s %s %s",
+                scope["method"],
+                scope["path"],
+                status,
+                extra={
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                },
+            )
+            request_id_var.reset(token)
@@ -0,0 +1,140 @@
+"""Degraded-mode helpers: DB call timeouts, a circuit breaker and
+last-known-good snapshots of catalog responses persisted to disk."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open, calls fail immediately. After ``reset_timeout`` seconds one
+    trial call is let through; its outcome closes or re-opens the breaker.
+    A ``failure_threshold`` of None disables the breaker: it never opens.
+    """
+
+    def __init__(self, failure_threshold: Optional[int] = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    async def call(self, operation: Callable[[], Awaitable[Any]], timeout: Optional[float]) -> Any:
+        state = self.state
+        if state == "open" or (state == "half-open" and self._trial_in_flight):
+            raise CircuitOpenError("database circuit is open")
+
+        # Only the half-open trial may close (or re-open) the breaker. Calls
+        # that started while it was closed and finish after it opened do not
+        # change its state.
+        is_trial = state == "half-open"
+        if is_trial:
+            self._trial_in_flight = True
+        try:
+            result = await asyncio.wait_for(operation(), timeout)
+        except Exception:
+            if is_trial:
+                self.opened_at = time.monotonic()
+                logger.warning("Database circuit re-opened after failed trial call")
+            elif self.opened_at is None:
+                self.failures += 1
+                if self.failure_threshold is not None and self.failures >= self.failure_threshold:
+                    self.opened_at = time.monotonic()
+                    logger.warning("Database circuit opened after %s failures", self.failures)
+            raise
+        finally:
+            if is_trial:
+                self._trial_in_flight = False
+
+        if is_trial:
+            logger.info("Database circuit closed")
+            self.failures = 0
+            self.opened_at = None
+        elif self.opened_at is None:
+            self.failures = 0
+        return result
+
+
+class SnapshotStore:
+    """Last-known-good JSON payloads keyed by endpoint, mirrored to a file.
+
+    Writes happen off the event loop and only when a payload changes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._data: Dict[str, Any] = {}
+        self._dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def load(self):
+        try:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            self._data = {}
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable snapshot file %s: %s", self.path, e)
+            self._data = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._data.get(key)
+
+    def put(self, key: str, payload: Any):
+        if self._data.get(key) == payload:
+            return
+        self._data[key] = payload
+        self._dirty = True
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def close(self):
+        if self._flush_task is not None:
+            await self._flush_task
+
+    async def _flush(self):
+        while self._dirty:
+            self._dirty = False
+            data = json.dumps(self._data, ensure_ascii=False)
+            try:
+                await asyncio.to_thread(self._write, data)
+            except OSError as e:
+                logger.warning("Could not persist snapshot file %s: %s", self.path, e)
+
+    def _write(self, data: str):
+        # A unique temp file per write, so concurrent writers (several
+        # workers, a stray process) never truncate each other's file.
+        with tempfile.NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.path.parent,
+            prefix=self.path.name + ".",
+            suffix=".tmp",
+            delete=False,
+        ) as tmp:
+            tmp.write(data)
+        try:
+            os.replace(tmp.name, self.path)
+        except OSError:
+            os.unlink(tmp.name)
+            raise
@@ -1,9 +1,10 @@
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, APIRouter, HTTPException, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import json
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, EmailStr
@@ -11,14 +12,43 @@ from typing import List, Optional
 import uuid
 from datetime import datetime
 
+from events import Broadcaster, sse_stream
+from logging_config import RequestLoggingMiddleware, configure_logging
+from resilience import CircuitBreaker, SnapshotStore
+from storage import ASCENDING, DESCENDING, storage_from_env
+
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Configure logging before anything else can log; access logs for the
+# high-traffic catalog routes are sampled at LOG_SAMPLE_RATE.
+_access_sample_rate = float(os.environ.get('LOG_SAMPLE_RATE', '0.1'))
+log_listener = configure_logging(
+    level=os.environ.get('LOG_LEVEL', 'INFO'),
+    sample_rates={
+        path: _access_sample_rate
+        for path in ('/api/projects', '/api/services', '/api/testimonials', '/api/company')
+    },
+)
+logger = logging.getLogger(__name__)
+
+# Degraded mode: every DB call gets a timeout and goes through one circuit
+# breaker; catalog responses fall back to their last-known-good snapshot.
+DB_TIMEOUT = float(os.environ.get('DB_TIMEOUT_SECONDS', '2.0'))
+
+# Storage backend (MongoDB by default, STORAGE_BACKEND=memory for offline runs).
+# The driver gets the same timeout so abandoned calls do not linger.
+storage = storage_from_env(timeout=DB_TIMEOUT)
+
+db_breaker = CircuitBreaker(
+    failure_threshold=int(os.environ.get('DB_BREAKER_THRESHOLD', '5')),
+    reset_timeout=float(os.environ.get('DB_BREAKER_RESET_SECONDS', '30')),
+)
+catalog_snapshots = SnapshotStore(os.environ.get('SNAPSHOT_PATH', ROOT_DIR / 'catalog_snapshot.json'))
+
+# Fan-out of newly created contacts for /api/contacts/stream
+contact_events = Broadcaster()
 
 # Create the main app without a prefix
 app = FastAPI(title="Exhibilo API", version="1.0.0")
@@ -89,6 +119,31 @@ class StatusCheck(BaseModel):
 class StatusCheckCreate(BaseModel):
     client_name: str
 
+# Categories offered by the site's project filter; only these are
+# snapshotted so arbitrary ?category= values cannot grow the snapshot file.
+PROJECT_CATEGORIES = ("Todos", "Cosmética", "Bebidas", "Alimentos", "Retail")
+
+async def serve_catalog(key, fetch, build):
+    """Run the ``fetch`` storage call under the breaker and ``build`` the
+    response from its result, falling back to the last snapshot when the
+    database call fails.
+
+    Only the storage call counts towards the breaker; errors raised by
+    ``build`` propagate. A ``key`` of None disables snapshotting.
+    """
+    try:
+        documents = await db_breaker.call(fetch, DB_TIMEOUT)
+    except Exception as e:
+        snapshot = catalog_snapshots.get(key) if key else None
+        if snapshot is None:
+            raise
+        logger.warning("Serving stale %s snapshot: %r", key, e)
+        return JSONResponse(content=snapshot, headers={"X-Exhibilo-Stale": "true"})
+    payload = jsonable_encoder(build(documents))
+    if key:
+        catalog_snapshots.put(key, payload)
+    return payload
+
 # Routes
 
 @api_router.get("/")
@@ -102,10 +157,15 @@ async def create_contact(contact_data: ContactCreate):
         contact_dict = contact_data.dict()
         contact_obj = Contact(**contact_dict)
         
-        # Insert into database
-        result = await db.contacts.insert_one(contact_obj.dict())
+        # Insert into database. The breaker still fails fast while open, but
+        # the insert is not cancelled by wait_for: a timed-out insert could
+        # commit after the client got a 500, duplicating the lead on retry
+        # and never reaching the stream. The driver's socketTimeoutMS
+        # (DB_TIMEOUT_SECONDS) bounds it instead.
+        inserted_id = await db_breaker.call(lambda: storage.contacts.insert_one(contact_obj.dict()), None)
         
-        if result.inserted_id:
+        if inserted_id:
+            contact_events.publish(json.dumps(jsonable_encoder(contact_obj)))
             return JSONResponse(
                 status_code=201,
                 content={
@@ -118,18 +178,28 @@ async def create_contact(contact_data: ContactCreate):
             raise HTTPException(status_code=500, detail="Error al enviar el mensaje")
             
     except Exception as e:
-        logger.error(f"Error creating contact: {str(e)}")
+        logger.error("Error creating contact: %s", e)
         raise HTTPException(status_code=500, detail="Error interno del servidor")
 
 @api_router.get("/contacts", response_model=List[Contact])
 async def get_contacts():
     try:
-        contacts = await db.contacts.find().sort("created_at", -1).to_list(1000)
+        contacts = await db_breaker.call(
+            lambda: storage.contacts.find(sort=("created_at", DESCENDING), limit=1000), DB_TIMEOUT
+        )
         return [Contact(**contact) for contact in contacts]
     except Exception as e:
-        logger.error(f"Error getting contacts: {str(e)}")
+        logger.error("Error getting contacts: %s", e)
         raise HTTPException(status_code=500, detail="Error al obtener contactos")
 
+@api_router.get("/contacts/stream")
+async def stream_contacts(last_event_id: Optional[str] = Header(None)):
+    return StreamingResponse(
+        sse_stream(contact_events, "contact", last_event_id or None),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # Projects endpoints
 @api_router.get("/projects")
 async def get_projects(category: Optional[str] = None):
@@ -137,38 +207,49 @@ async def get_projects(category: Optional[str] = None):
         query = {}
         if category and category != "Todos":
             query["category"] = category
-            
-        projects = await db.projects.find(query).sort("created_at", -1).to_list(1000)
-        return {"projects": [Project(**project) for project in projects]}
+
+        snapshot_category = query.get("category", "Todos")
+        snapshot_key = f"projects:{snapshot_category}" if snapshot_category in PROJECT_CATEGORIES else None
+        return await serve_catalog(
+            snapshot_key,
+            lambda: storage.projects.find(query, sort=("created_at", DESCENDING), limit=1000),
+            lambda projects: {"projects": [Project(**project) for project in projects]},
+        )
     except Exception as e:
-        logger.error(f"Error getting projects: {str(e)}")
+        logger.error("Error getting projects: %s", e)
         raise HTTPException(status_code=500, detail="Error al obtener proyectos")
 
 # Services endpoints
 @api_router.get("/services")
 async def get_services():
     try:
-        services = await db.services.find().sort("order", 1).to_list(1000)
-        return {"services": [Service(**service) for service in services]}
+        return await serve_catalog(
+            "services",
+            lambda: storage.services.find(sort=("order", ASCENDING), limit=1000),
+            lambda services: {"services": [Service(**service) for service in services]},
+        )
     except Exception as e:
-        logger.error(f"Error getting services: {str(e)}")
+        logger.error("Error getting services: %s", e)
         raise HTTPException(status_code=500, detail="Error al obtener servicios")
 
 # Testimonials endpoints
 @api_router.get("/testimonials")
 async def get_testimonials():
     try:
-        testimonials = await db.testimonials.find({"active": True}).sort("created_at", -1).to_list(1000)
-        return {"testimonials": [Testimonial(**testimonial) for testimonial in testimonials]}
+        return await serve_catalog(
+            "testimonials",
+            lambda: storage.testimonials.find({"active": True}, sort=("created_at", DESCENDING), limit=1000),
+            lambda testimonials: {"testimonials": [Testimonial(**testimonial) for testimonial in testimonials]},
+        )
     except Exception as e:
-        logger.error(f"Error getting testimonials: {str(e)}")
+        logger.error("Error getting testimonials: %s", e)
         raise HTTPException(status_code=500, detail="Error al obtener testimoniales")
 
 # Company info endpoints
 @api_router.get("/company")
 async def get_company_info():
     try:
-        company = await db.company.find_one()
+        company = await db_breaker.call(storage.company.find_one, DB_TIMEOUT)
         if not company:
             # Return default company info if not found
             return {
@@ -185,7 +266,7 @@ async def get_company_info():
             }
         return CompanyInfo(**company)
     except Exception as e:
-        logger.error(f"Error getting company info: {str(e)}")
+        logger.error("Error getting company info: %s", e)
         raise HTTPException(status_code=500, detail="Error al obtener información de la empresa")
 
 # Data seeding endpoint
@@ -218,8 +299,8 @@ async def seed_database():
         ]
         
         # Clear existing and insert new services
-        await db.services.delete_many({})
-        await db.services.insert_many(services_data)
+        await storage.services.delete_many()
+        await storage.services.insert_many(services_data)
         
         # Seed projects
         projects_data = [
@@ -280,8 +361,8 @@ async def seed_database():
         ]
         
         # Clear existing and insert new projects
-        await db.projects.delete_many({})
-        await db.projects.insert_many(projects_data)
+        await storage.projects.delete_many()
+        await storage.projects.insert_many(projects_data)
         
         # Seed testimonials
         testimonials_data = [
@@ -315,13 +396,13 @@ async def seed_database():
         ]
         
         # Clear existing and insert new testimonials
-        await db.testimonials.delete_many({})
-        await db.testimonials.insert_many(testimonials_data)
+        await storage.testimonials.delete_many()
+        await storage.testimonials.insert_many(testimonials_data)
         
         return {"message": "Database seeded successfully"}
         
     except Exception as e:
-        logger.error(f"Error seeding database: {str(e)}")
+        logger.error("Error seeding database: %s", e)
         raise HTTPException(status_code=500, detail="Error al poblar la base de datos")
 
 # Legacy endpoints for compatibility
@@ -329,12 +410,12 @@ async def seed_database():
 async def create_status_check(input: StatusCheckCreate):
     status_dict = input.dict()
     status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
+    _ = await storage.status_checks.insert_one(status_obj.dict())
     return status_obj
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
+    status_checks = await storage.status_checks.find(limit=1000)
     return [StatusCheck(**status_check) for status_check in status_checks]
 
 # Include the router in the main app
@@ -348,13 +429,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
+app.add_middleware(RequestLoggingMiddleware)
+
+@app.on_event("startup")
+async def load_catalog_snapshots():
+    catalog_snapshots.load()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
+    await catalog_snapshots.close()
+    storage.close()
+    log_listener.stop()
@@ -0,0 +1,248 @@
+"""Storage backends for the Exhibilo API.
+
+Handlers talk to a ``Storage`` object instead of the Motor database handle.
+``MongoStorage`` wraps Motor; ``MemoryStorage`` keeps documents in process and
+mirrors the filter/sort semantics the handlers rely on, so the API can run
+without MongoDB (tests, benchmarks, read-only edge replicas).
+"""
+
+import copy
+import heapq
+import os
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+Document = Dict[str, Any]
+Sort = Optional[Tuple[str, int]]
+
+ASCENDING = 1
+DESCENDING = -1
+
+COLLECTIONS = ("contacts", "projects", "services", "testimonials", "company", "status_checks")
+
+
+class Repository(ABC):
+    """Minimal document repository used by the API handlers."""
+
+    @abstractmethod
+    async def find(self, query: Optional[Document] = None, sort: Sort = None, limit: int = 1000) -> List[Document]:
+        ...
+
+    @abstractmethod
+    async def find_one(self, query: Optional[Document] = None) -> Optional[Document]:
+        ...
+
+    @abstractmethod
+    async def insert_one(self, document: Document) -> Any:
+        """Insert a document and return its inserted id (falsy on failure)."""
+
+    @abstractmethod
+    async def insert_many(self, documents: List[Document]) -> int:
+        """Insert documents and return how many were written."""
+
+    @abstractmethod
+    async def delete_many(self, query: Optional[Document] = None) -> int:
+        """Delete matching documents and return how many were removed."""
+
+
+class MongoRepository(Repository):
+    def __init__(self, collection):
+        self._collection = collection
+
+    async def find(self, query=None, sort=None, limit=1000):
+        cursor = self._collection.find(query or {})
+        if sort:
+            cursor = cursor.sort(*sort)
+        return await cursor.to_list(limit)
+
+    async def find_one(self, query=None):
+        return await self._collection.find_one(query or {})
+
+    async def insert_one(self, document):
+        result = await self._collection.insert_one(document)
+        return result.inserted_id
+
+    async def insert_many(self, documents):
+        if not documents:
+            return 0
+        result = await self._collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+
+    async def delete_many(self, query=None):
+        result = await self._collection.delete_many(query or {})
+        return result.deleted_count
+
+
+def _matches(document: Document, query: Document) -> bool:
+    # Equality filters only; that is all the handlers issue. Values are
+    # compared by BSON type as well, so True does not match 1.
+    return all(
+        _type_rank(document.get(key)) == _type_rank(value) and document.get(key) == value
+        for key, value in query.items()
+    )
+
+
+def _type_rank(value: Any) -> int:
+    # BSON comparison order: null < numbers < strings < objects < arrays
+    # < binary < ObjectId/other < booleans < dates.
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return 7
+    if isinstance(value, (int, float)):
+        return 1
+    if isinstance(value, str):
+        return 2
+    if isinstance(value, dict):
+        return 3
+    if isinstance(value, (list, tuple)):
+        return 4
+    if isinstance(value, bytes):
+        return 5
+    if isinstance(value, datetime):
+        return 8
+    return 6
+
+
+def _order_value(value: Any) -> tuple:
+    """Totally ordered key for ``value`` following BSON comparison order.
+
+    Objects compare field by field and arrays element by element (MongoDB
+    sorts arrays by their smallest/largest element instead). Naive datetimes
+    are taken as UTC, as the driver stores them, so they order against aware
+    ones. Values of an unknown type compare by type name and ``str()``.
+    """
+    rank = _type_rank(value)
+    if rank == 0:
+        return (0,)
+    if rank == 3:
+        return (3, tuple((key, _order_value(item)) for key, item in value.items()))
+    if rank == 4:
+        return (4, tuple(_order_value(item) for item in value))
+    if rank == 5:
+        return (5, len(value), value)
+    if rank == 6:
+        return (6, type(value).__name__, str(value))
+    if rank == 8:
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (8, value.astimezone(timezone.utc))
+    return (rank, value)
+
+
+def _sort_key(field: str):
+    # Missing fields sort like None.
+    def key(document: Document):
+        return _order_value(document.get(field))
+    return key
+
+
+class MemoryRepository(Repository):
+    def __init__(self):
+        # Handlers never await between reading and writing this list, so the
+        # event loop already serialises access to it.
+        self._documents: List[Document] = []
+
+    async def find(self, query=None, sort=None, limit=1000):
+        query = query or {}
+        matched = [doc for doc in self._documents if _matches(doc, query)]
+        if sort:
+            field, direction = sort
+            key = _sort_key(field)
+            # Both paths are stable, like MongoDB's natural order for ties.
+            # With a limit only the top ``limit`` documents are kept in a heap
+            # (O(n log limit)) instead of sorting the whole collection.
+            if limit and limit < len(matched):
+                select = heapq.nlargest if direction == DESCENDING else heapq.nsmallest
+                matched = select(limit, matched, key=key)
+            else:
+                matched = sorted(matched, key=key, reverse=direction == DESCENDING)
+        elif limit:
+            matched = matched[:limit]
+        return [copy.deepcopy(doc) for doc in matched]
+
+    async def find_one(self, query=None):
+        query = query or {}
+        for doc in self._documents:
+            if _matches(doc, query):
+                return copy.deepcopy(doc)
+        return None
+
+    async def insert_one(self, document):
+        stored = copy.deepcopy(document)
+        stored.setdefault("_id", stored.get("id") or str(uuid.uuid4()))
+        self._documents.append(stored)
+        return stored["_id"]
+
+    async def insert_many(self, documents):
+        stored = []
+        for document in documents:
+            doc = copy.deepcopy(document)
+            doc.setdefault("_id", doc.get("id") or str(uuid.uuid4()))
+            stored.append(doc)
+        self._documents.extend(stored)
+        return len(stored)
+
+    async def delete_many(self, query=None):
+        query = query or {}
+        kept = [doc for doc in self._documents if not _matches(doc, query)]
+        deleted = len(self._documents) - len(kept)
+        self._documents = kept
+        return deleted
+
+
+class Storage:
+    """Groups one repository per collection used by the API."""
+
+    def __init__(self, repositories: Dict[str, Repository], close=None):
+        self.contacts = repositories["contacts"]
+        self.projects = repositories["projects"]
+        self.services = repositories["services"]
+        self.testimonials = repositories["testimonials"]
+        self.company = repositories["company"]
+        self.status_checks = repositories["status_checks"]
+        self._close = close
+
+    def close(self):
+        if self._close:
+            self._close()
+
+
+class MongoStorage(Storage):
+    def __init__(self, mongo_url: str, db_name: str, timeout: Optional[float] = None):
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        # Bound server selection, connects and socket reads at the driver
+        # level: asyncio.wait_for only stops waiting, while the Motor call
+        # keeps its executor thread until the driver gives up.
+        options = {}
+        if timeout:
+            timeout_ms = int(timeout * 1000)
+            options = {
+                "serverSelectionTimeoutMS": timeout_ms,
+                "connectTimeoutMS": timeout_ms,
+                "socketTimeoutMS": timeout_ms,
+            }
+        client = AsyncIOMotorClient(mongo_url, **options)
+        db = client[db_name]
+        super().__init__({name: MongoRepository(db[name]) for name in COLLECTIONS}, close=client.close)
+
+
+class MemoryStorage(Storage):
+    def __init__(self):
+        super().__init__({name: MemoryRepository() for name in COLLECTIONS})
+
+
+def storage_from_env(timeout: Optional[float] = None) -> Storage:
+    """Build the storage selected by ``STORAGE_BACKEND`` (``mongo`` or ``memory``).
+
+    ``timeout`` (seconds) bounds MongoDB driver operations.
+    """
+    backend = os.environ.get("STORAGE_BACKEND", "mongo").lower()
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "mongo":
+        return MongoStorage(os.environ["MONGO_URL"], os.environ["DB_NAME"], timeout)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {backend}")
@@ -6,12 +6,13 @@ Tests all API endpoints with proper validation and error handling
 
 import requests
 import json
+import os
 import sys
 from datetime import datetime
 import uuid
 
 # Configuration
-BACKEND_URL = "https://retail-solutions-1.preview.emergentagent.com"
+BACKEND_URL = os.environ.get("BACKEND_URL", "https://retail-solutions-1.preview.emergentagent.com")
 API_BASE = f"{BACKEND_URL}/api"
 
 class BackendTester:
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# The server reads these at import time; keep the suite offline and away from
+# the real snapshot file.
+os.environ["STORAGE_BACKEND"] = "memory"
+os.environ["SNAPSHOT_PATH"] = os.path.join(tempfile.mkdtemp(prefix="exhibilo-tests-"), "catalog_snapshot.json")
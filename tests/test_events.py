@@ -0,0 +1,123 @@
+import asyncio
+
+from events import Broadcaster, sse_stream
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def collect(stream, count):
+    return [await stream.__anext__() for _ in range(count)]
+
+
+def test_publish_fans_out_to_every_subscriber():
+    async def main():
+        broadcaster = Broadcaster()
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        broadcaster.publish("a")
+        return await first.get(), await second.get()
+
+    assert run(main()) == ((1, "a"), (1, "a"))
+
+
+def test_unsubscribe_stops_delivery():
+    async def main():
+        broadcaster = Broadcaster()
+        subscription = broadcaster.subscribe()
+        broadcaster.unsubscribe(subscription)
+        broadcaster.publish("a")
+        try:
+            await asyncio.wait_for(subscription.get(), 0.01)
+        except asyncio.TimeoutError:
+            return None
+        return "delivered"
+
+    assert run(main()) is None
+
+
+def test_resume_replays_full_history_beyond_buffer():
+    async def main():
+        broadcaster = Broadcaster(history_size=10, subscriber_buffer=2)
+        for i in range(8):
+            broadcaster.publish(str(i))
+        subscription = broadcaster.subscribe(last_event_id=broadcaster.format_id(3))
+        broadcaster.publish("live")
+        return [await subscription.get() for _ in range(6)], subscription.take_dropped()
+
+    events, dropped = run(main())
+    assert [event_id for event_id, _ in events] == [4, 5, 6, 7, 8, 9]
+    assert events[-1] == (9, "live")
+    assert dropped == 0
+
+
+def test_slow_subscriber_gets_resync_marker():
+    async def main():
+        broadcaster = Broadcaster(subscriber_buffer=2)
+        stream = sse_stream(broadcaster, "contact", heartbeat=1)
+        frames = await collect(stream, 1)
+        await asyncio.sleep(0)
+        for data in ("a", "b", "c", "d"):
+            broadcaster.publish(data)
+        frames += await collect(stream, 3)
+        await stream.aclose()
+        return frames, broadcaster
+
+    frames, broadcaster = run(main())
+    assert frames[0].startswith("retry:")
+    assert frames[1] == 'event: resync\ndata: {"dropped": 2}\n\n'
+    assert frames[2] == f"id: {broadcaster.epoch}-3\nevent: contact\ndata: c\n\n"
+    assert frames[3] == f"id: {broadcaster.epoch}-4\nevent: contact\ndata: d\n\n"
+    assert not broadcaster._subscribers
+
+
+def test_stream_sends_keep_alive_when_idle():
+    async def main():
+        stream = sse_stream(Broadcaster(), "contact", heartbeat=0.01)
+        frames = await collect(stream, 2)
+        await stream.aclose()
+        return frames
+
+    assert run(main())[1] == ": keep-alive\n\n"
+
+
+def test_resume_past_trimmed_history_sends_resync_then_replays():
+    async def main():
+        broadcaster = Broadcaster(history_size=3)
+        for i in range(6):
+            broadcaster.publish(str(i))
+        stream = sse_stream(broadcaster, "contact", broadcaster.format_id(1), heartbeat=1)
+        frames = await collect(stream, 3)
+        await stream.aclose()
+        return frames, broadcaster.epoch
+
+    frames, epoch = run(main())
+    assert frames[1] == 'event: resync\ndata: {"dropped": 2}\n\n'
+    assert frames[2] == f"id: {epoch}-4\nevent: contact\ndata: 3\n\n"
+
+
+def test_resume_from_another_process_sends_resync():
+    async def main():
+        broadcaster = Broadcaster()
+        for i in range(400):
+            broadcaster.publish(str(i))
+        stream = sse_stream(broadcaster, "contact", "0ldepoch-342", heartbeat=0.01)
+        frames = await collect(stream, 3)
+        await stream.aclose()
+        return frames
+
+    frames = run(main())
+    assert frames[1] == 'event: resync\ndata: {"dropped": null}\n\n'
+    assert frames[2] == ": keep-alive\n\n"
+
+
+def test_resume_from_unknown_id_sends_resync():
+    async def main():
+        broadcaster = Broadcaster()
+        broadcaster.publish("a")
+        for last_event_id in (broadcaster.format_id(5), "342", "garbage"):
+            subscription = broadcaster.subscribe(last_event_id)
+            assert subscription.missed is None
+        assert broadcaster.subscribe(broadcaster.format_id(1)).missed == 0
+
+    run(main())
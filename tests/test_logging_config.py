@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+
+import pytest
+
+pytest.importorskip("starlette")
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.middleware import Middleware  # noqa: E402
+from starlette.responses import PlainTextResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from logging_config import (  # noqa: E402
+    ACCESS_LOGGER,
+    RequestIdFilter,
+    RequestLoggingMiddleware,
+    SamplingFilter,
+    configure_logging,
+    request_id_var,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+async def echo_request_id(request):
+    return PlainTextResponse(request_id_var.get())
+
+
+async def fail(request):
+    return PlainTextResponse("error", status_code=500)
+
+
+app = Starlette(
+    routes=[Route("/echo", echo_request_id), Route("/sampled", echo_request_id), Route("/fail", fail)],
+    middleware=[Middleware(RequestLoggingMiddleware)],
+)
+
+
+def get(path, headers=()):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": ("testclient", 50000),
+        "server": ("testserver", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    start = messages[0]
+    body = b"".join(message.get("body", b"") for message in messages[1:])
+    return start["status"], dict(start["headers"]), body.decode()
+
+
+@pytest.fixture
+def access_records():
+    logger = logging.getLogger(ACCESS_LOGGER)
+    handler = ListHandler()
+    handler.addFilter(RequestIdFilter())
+    handler.addFilter(SamplingFilter({"/sampled": 0.0, "/fail": 0.0}))
+    propagate, level = logger.propagate, logger.level
+    logger.addHandler(handler)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    yield handler.records
+    logger.removeHandler(handler)
+    logger.propagate = propagate
+    logger.setLevel(level)
+
+
+def test_generates_request_id_and_echoes_it(access_records):
+    status, headers, body = get("/echo")
+    request_id = headers[b"x-request-id"].decode()
+    assert status == 200
+    assert len(request_id) == 32
+    assert body == request_id
+    assert access_records[0].request_id == request_id
+    assert access_records[0].path == "/echo"
+    assert access_records[0].status == 200
+    assert request_id_var.get() == "-"
+
+
+def test_propagates_incoming_request_id(access_records):
+    _, headers, body = get("/echo", headers=[("X-Request-ID", "abc-123")])
+    assert headers[b"x-request-id"] == b"abc-123"
+    assert body == "abc-123"
+    assert access_records[0].request_id == "abc-123"
+
+
+def test_sampling_drops_info_but_keeps_errors(access_records):
+    get("/sampled")
+    get("/fail")
+    assert [(record.path, record.levelno) for record in access_records] == [("/fail", logging.ERROR)]
+
+
+def test_sampling_keeps_warnings_from_any_logger():
+    sampling = SamplingFilter({"/sampled": 0.0})
+    record = logging.makeLogRecord({"name": ACCESS_LOGGER, "levelno": logging.WARNING, "path": "/sampled"})
+    assert sampling.filter(record)
+
+
+@pytest.fixture
+def restore_logging():
+    names = ("", "uvicorn", "uvicorn.error", "uvicorn.access")
+    saved = {
+        name: (logging.getLogger(name).handlers[:], logging.getLogger(name).level,
+               logging.getLogger(name).propagate, logging.getLogger(name).disabled)
+        for name in names
+    }
+    yield
+    for name, (handlers, level, propagate, disabled) in saved.items():
+        logger = logging.getLogger(name)
+        logger.handlers = handlers
+        logger.setLevel(level)
+        logger.propagate = propagate
+        logger.disabled = disabled
+
+
+def test_full_queue_drops_and_listener_reports_them(restore_logging, capsys):
+    listener = configure_logging(queue_size=1)
+    listener.stop()
+    capsys.readouterr()
+
+    token = request_id_var.set("req-1")
+    logging.getLogger("test").info("kept")
+    logging.getLogger("test").info("dropped")
+    request_id_var.reset(token)
+    assert listener.queue_handler.dropped == 1
+
+    listener.start()
+    listener.stop()
+    lines = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [line["message"] for line in lines] == [
+        "kept",
+        "Dropped 1 log records because the queue was full",
+    ]
+    assert lines[0]["request_id"] == "req-1"
+    assert lines[1]["level"] == "WARNING"
+
+
+def test_uvicorn_logs_go_through_the_queue(restore_logging):
+    listener = configure_logging()
+    try:
+        assert logging.getLogger("uvicorn.error").handlers == []
+        assert logging.getLogger("uvicorn.error").propagate
+        assert logging.getLogger("uvicorn.access").disabled
+    finally:
+        listener.stop()
@@ -0,0 +1,182 @@
+import asyncio
+import json
+
+import pytest
+
+from resilience import CircuitBreaker, CircuitOpenError, SnapshotStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+async def ok():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("db down")
+
+
+async def slow_ok():
+    await asyncio.sleep(0.05)
+    return "ok"
+
+
+async def trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail, 1)
+
+
+def test_opens_after_threshold_and_fails_fast():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        await trip(breaker)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok, 1)
+
+    run(main())
+
+
+def test_success_resets_failure_count():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail, 1)
+        assert await breaker.call(ok, 1) == "ok"
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail, 1)
+        assert breaker.state == "closed"
+
+    run(main())
+
+
+def test_timeout_counts_as_failure():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.call(slow_ok, 0.001)
+        assert breaker.state == "open"
+
+    run(main())
+
+
+def test_disabled_breaker_never_opens():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=None)
+        for _ in range(20):
+            with pytest.raises(RuntimeError):
+                await breaker.call(fail, 1)
+        assert breaker.state == "closed"
+        assert await breaker.call(ok, None) == "ok"
+
+    run(main())
+
+
+def test_late_success_does_not_close_open_breaker():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        slow = asyncio.create_task(breaker.call(slow_ok, 1))
+        await asyncio.sleep(0)
+        await trip(breaker)
+        assert await slow == "ok"
+        assert breaker.state == "open"
+
+    run(main())
+
+
+def test_half_open_allows_a_single_trial():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        await trip(breaker)
+        await asyncio.sleep(0.02)
+        assert breaker.state == "half-open"
+        trial = asyncio.create_task(breaker.call(slow_ok, 1))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok, 1)
+        assert await trial == "ok"
+        assert breaker.state == "closed"
+
+    run(main())
+
+
+def test_late_call_does_not_clear_trial_flag():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        early = asyncio.create_task(breaker.call(slow_ok, 1))
+        await asyncio.sleep(0)
+        await trip(breaker)
+        await asyncio.sleep(0.02)
+        trial = asyncio.create_task(breaker.call(lambda: asyncio.sleep(0.1), 1))
+        await early
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok, 1)
+        await trial
+        assert breaker.state == "closed"
+
+    run(main())
+
+
+def test_failed_trial_reopens():
+    async def main():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        await trip(breaker)
+        await asyncio.sleep(0.02)
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail, 1)
+        assert breaker.state == "open"
+
+    run(main())
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "snapshot.json"
+
+    async def main():
+        store = SnapshotStore(path)
+        store.load()
+        store.put("services", {"services": [{"title": "Diseño"}]})
+        store.put("testimonials", {"testimonials": []})
+        await store.close()
+
+    run(main())
+    loaded = SnapshotStore(path)
+    loaded.load()
+    assert loaded.get("services") == {"services": [{"title": "Diseño"}]}
+    assert loaded.get("testimonials") == {"testimonials": []}
+    assert loaded.get("projects:Todos") is None
+
+
+def test_snapshot_skips_unchanged_payloads(tmp_path, monkeypatch):
+    store = SnapshotStore(tmp_path / "snapshot.json")
+    writes = []
+    monkeypatch.setattr(store, "_write", writes.append)
+
+    async def main():
+        store.put("services", {"services": []})
+        await store.close()
+        store.put("services", {"services": []})
+        await store.close()
+
+    run(main())
+    assert writes == [json.dumps({"services": {"services": []}})]
+
+
+def test_snapshot_ignores_unreadable_file(tmp_path):
+    path = tmp_path / "snapshot.json"
+    path.write_text("{not json", encoding="utf-8")
+    store = SnapshotStore(path)
+    store.load()
+    assert store.get("services") is None
+
+
+def test_snapshot_writes_leave_no_temp_files(tmp_path):
+    path = tmp_path / "snapshot.json"
+    first, second = SnapshotStore(path), SnapshotStore(path)
+    first._write(json.dumps({"services": 1}))
+    second._write(json.dumps({"services": 2}))
+    assert [p.name for p in tmp_path.iterdir()] == ["snapshot.json"]
+    assert json.loads(path.read_text(encoding="utf-8")) == {"services": 2}
@@ -0,0 +1,122 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+import server  # noqa: E402
+from fastapi import HTTPException  # noqa: E402
+from resilience import CircuitBreaker, SnapshotStore  # noqa: E402
+from storage import MemoryStorage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch, tmp_path):
+    monkeypatch.setattr(server, "storage", MemoryStorage())
+    monkeypatch.setattr(server, "catalog_snapshots", SnapshotStore(tmp_path / "snapshot.json"))
+    monkeypatch.setattr(server, "db_breaker", CircuitBreaker())
+
+
+def run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await server.catalog_snapshots.close()
+    return asyncio.run(main())
+
+
+def test_seeded_catalog():
+    run(server.seed_database())
+
+    projects = run(server.get_projects())["projects"]
+    assert len(projects) == 6
+    assert [p["created_at"] for p in projects] == sorted((p["created_at"] for p in projects), reverse=True)
+
+    retail = run(server.get_projects("Retail"))["projects"]
+    assert {p["category"] for p in retail} == {"Retail"}
+    assert len(retail) == 2
+    assert len(run(server.get_projects("Todos"))["projects"]) == 6
+
+    services = run(server.get_services())["services"]
+    assert [s["order"] for s in services] == [1, 2, 3]
+
+    assert len(run(server.get_testimonials())["testimonials"]) == 3
+
+
+def test_testimonials_only_active():
+    run(server.storage.testimonials.insert_many([
+        {"id": "a", "quote": "q", "author": "a", "position": "p", "company": "c", "active": True},
+        {"id": "b", "quote": "q", "author": "b", "position": "p", "company": "c", "active": False},
+    ]))
+    testimonials = run(server.get_testimonials())["testimonials"]
+    assert [t["id"] for t in testimonials] == ["a"]
+
+
+def test_create_and_list_contacts():
+    data = {
+        "name": "Juan Pérez",
+        "company": "Empresa Test SA",
+        "email": "juan.perez@empresatest.com",
+        "industry": "Retail",
+        "message": "Necesitamos exhibidores",
+    }
+    response = run(server.create_contact(server.ContactCreate(**data)))
+    assert response.status_code == 201
+    contact_id = json.loads(response.body)["contact_id"]
+
+    run(server.storage.contacts.insert_many([
+        {**data, "id": "old", "created_at": datetime(2020, 1, 1)},
+        {**data, "id": "older", "created_at": datetime(2019, 1, 1)},
+    ]))
+    contacts = run(server.get_contacts())
+    assert [c.id for c in contacts] == [contact_id, "old", "older"]
+
+
+def test_company_info_default():
+    assert run(server.get_company_info())["name"] == "Exhibilo"
+
+
+def test_catalog_served_from_snapshot_when_storage_fails(monkeypatch):
+    run(server.seed_database())
+    fresh = run(server.get_services())
+
+    async def fail(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(server.storage.services, "find", fail)
+    stale = run(server.get_services())
+    assert stale.headers["x-exhibilo-stale"] == "true"
+    assert json.loads(stale.body) == fresh
+
+
+def test_unknown_category_is_not_snapshotted():
+    run(server.seed_database())
+    run(server.get_projects("Retail"))
+    assert run(server.get_projects("Desconocida")) == {"projects": []}
+    assert server.catalog_snapshots.get("projects:Retail") is not None
+    assert server.catalog_snapshots.get("projects:Desconocida") is None
+
+
+def test_bad_document_is_not_a_database_failure():
+    run(server.storage.projects.insert_one({"id": "broken", "title": "Sin categoría"}))
+    with pytest.raises(HTTPException):
+        run(server.get_projects())
+    assert server.db_breaker.failures == 0
+
+
+def test_contact_insert_is_not_cut_short_by_db_timeout(monkeypatch):
+    insert_one = server.storage.contacts.insert_one
+
+    async def slow_insert(document):
+        await asyncio.sleep(0.05)
+        return await insert_one(document)
+
+    monkeypatch.setattr(server, "DB_TIMEOUT", 0.001)
+    monkeypatch.setattr(server.storage.contacts, "insert_one", slow_insert)
+    data = {"name": "Ana", "company": "C", "email": "ana@example.com", "industry": "Retail", "message": "Hola"}
+    response = run(server.create_contact(server.ContactCreate(**data)))
+    assert response.status_code == 201
+    assert len(run(server.storage.contacts.find())) == 1
@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from storage import ASCENDING, DESCENDING, MemoryRepository, MemoryStorage
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def ids(documents):
+    return [doc["id"] for doc in documents]
+
+
+def make_repository(documents):
+    repository = MemoryRepository()
+    run(repository.insert_many(documents))
+    return repository
+
+
+def test_find_filters_by_equality():
+    repository = make_repository([
+        {"id": "a", "category": "Retail", "active": True},
+        {"id": "b", "category": "Bebidas", "active": True},
+        {"id": "c", "category": "Retail", "active": False},
+    ])
+    assert ids(run(repository.find({"category": "Retail"}))) == ["a", "c"]
+    assert ids(run(repository.find({"category": "Retail", "active": True}))) == ["a"]
+    assert run(repository.find({"category": "Otro"})) == []
+
+
+def test_find_does_not_match_across_bson_types():
+    repository = make_repository([
+        {"id": "bool", "active": True},
+        {"id": "int", "active": 1},
+        {"id": "float", "active": 1.0},
+    ])
+    assert ids(run(repository.find({"active": True}))) == ["bool"]
+    assert ids(run(repository.find({"active": 1}))) == ["int", "float"]
+    assert run(repository.find_one({"active": False})) is None
+
+
+def test_find_sorts_none_and_missing_first_ascending():
+    repository = make_repository([
+        {"id": "a", "order": 2},
+        {"id": "b", "order": None},
+        {"id": "c", "order": 1},
+        {"id": "d"},
+    ])
+    assert ids(run(repository.find(sort=("order", ASCENDING)))) == ["b", "d", "c", "a"]
+    assert ids(run(repository.find(sort=("order", DESCENDING)))) == ["a", "c", "b", "d"]
+
+
+def test_find_sort_is_stable_for_ties():
+    repository = make_repository([{"id": str(i), "order": i % 2} for i in range(6)])
+    assert ids(run(repository.find(sort=("order", ASCENDING)))) == ["0", "2", "4", "1", "3", "5"]
+    assert ids(run(repository.find(sort=("order", DESCENDING), limit=2))) == ["1", "3"]
+
+
+def test_find_limit_matches_full_sort():
+    documents = [{"id": str(i), "created_at": datetime(2024, 1, 1 + (i * 7) % 28)} for i in range(50)]
+    repository = make_repository(documents)
+    full = ids(run(repository.find(sort=("created_at", DESCENDING), limit=0)))
+    assert ids(run(repository.find(sort=("created_at", DESCENDING), limit=10))) == full[:10]
+    assert len(run(repository.find(limit=5))) == 5
+
+
+def test_find_orders_mixed_types_like_mongodb():
+    repository = make_repository([
+        {"id": "date", "value": datetime(2024, 1, 1)},
+        {"id": "bool", "value": True},
+        {"id": "str", "value": "a"},
+        {"id": "num", "value": 3},
+        {"id": "none", "value": None},
+    ])
+    assert ids(run(repository.find(sort=("value", ASCENDING)))) == ["none", "num", "str", "bool", "date"]
+
+
+def test_find_orders_values_of_the_same_type_without_errors():
+    repository = make_repository([
+        {"id": "b", "value": {"x": 2}},
+        {"id": "a", "value": {"x": 1}},
+    ])
+    assert ids(run(repository.find(sort=("value", ASCENDING)))) == ["a", "b"]
+
+    repository = make_repository([
+        {"id": "aware", "value": datetime(2024, 1, 1, 12, tzinfo=timezone.utc)},
+        {"id": "naive", "value": datetime(2024, 1, 1, 11)},
+    ])
+    assert ids(run(repository.find(sort=("value", ASCENDING)))) == ["naive", "aware"]
+
+
+def test_find_returns_copies():
+    repository = make_repository([{"id": "a", "tags": ["x"]}])
+    run(repository.find())[0]["tags"].append("y")
+    assert run(repository.find_one({"id": "a"}))["tags"] == ["x"]
+
+
+def test_insert_one_returns_id_and_find_one():
+    repository = MemoryRepository()
+    assert run(repository.insert_one({"id": "a", "name": "Ana"})) == "a"
+    assert run(repository.find_one({"name": "Ana"}))["id"] == "a"
+    assert run(repository.find_one({"name": "Juan"})) is None
+
+
+def test_delete_many():
+    repository = make_repository([
+        {"id": "a", "category": "Retail"},
+        {"id": "b", "category": "Bebidas"},
+        {"id": "c", "category": "Retail"},
+    ])
+    assert run(repository.delete_many({"category": "Retail"})) == 2
+    assert ids(run(repository.find())) == ["b"]
+    assert run(repository.delete_many()) == 1
+    assert run(repository.find()) == []
+
+
+def test_memory_storage_has_independent_collections():
+    storage = MemoryStorage()
+    run(storage.projects.insert_one({"id": "a"}))
+    assert run(storage.services.find()) == []
+
+
+def test_mongo_storage_passes_timeout_to_driver():
+    pytest.importorskip("motor")
+    from storage import MongoStorage
+
+    storage = MongoStorage("mongodb://localhost:27017", "exhibilo_test", timeout=1.5)
+    options = storage.contacts._collection.database.client.options
+    assert options.server_selection_timeout == 1.5
+    assert options.pool_options.connect_timeout == 1.5
+    assert options.pool_options.socket_timeout == 1.5
+    storage.close()